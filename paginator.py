@@ -1,5 +1,7 @@
-from asyncio import TimeoutError
-from typing import Dict, Optional, Union
+from asyncio import FIRST_COMPLETED, Event, Task, create_task, gather, wait
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, Optional, Sequence, Union
 
 from discord import Embed, Member, Message, Reaction, User, errors
 from discord.embeds import _EmptyEmbed
@@ -17,8 +19,10 @@ class _PaginatorBase:
     STANDART_EMOJIS: :class:`tuple`
         Эмодзи по умолчанию, в формате: 
         `top`, `previous`, `stop`, `next`, `end`
+    none_types: :class:`frozenset`
+        Все NoneType виды в Embed.
     pages: :class:`dict`
-        Список страниц.
+        Список страниц по индексу категории.
     category: :class:`int`
         Текущая категория.
     current: :class:`int`
@@ -35,8 +39,8 @@ class _PaginatorBase:
     Kwargs
     ------
     emojis: Optional[:class:`tuple`]
-        Кортеж с эмодзи, которые будут использоваться в качестве реакций.
-        По умолчанию - STANDART_EMOJIS.
+        Кортеж из 5 эмодзи, которые будут использоваться в качестве реакций,
+        в формате STANDART_EMOJIS. По умолчанию - STANDART_EMOJIS.
     delete_message: Optional[:class:`bool`]
         Нужно ли удалять сообщение, при остановке Paginator 
         или истечении время ожидания. По умолчанию - False.
@@ -61,12 +65,14 @@ class _PaginatorBase:
         Привязывает Paginator к конкретному сообщению, либо отправляет новое.
     await pagination(emoji)
         Отвечает за действие, при нажатии реакции под сообщением.
+        Возвращает `True`, если текущая страница изменилась.
     await generate_embed()
         Генерирует и возвращает Embed в зависимости от текущей страницы
         и предпочтений.
         Для переопределения.
     """
     STANDART_EMOJIS = ("⏪", "◀", "⏹", "▶", "⏩")
+    none_types = frozenset((None, "", Embed.Empty))
 
     def __init__(self, 
         bot: Union[Bot, AutoShardedBot], 
@@ -76,16 +82,21 @@ class _PaginatorBase:
         self.bot = bot
         self.ctx = context
 
-        self.emojis: tuple = kwargs.get("emojis", self.STANDART_EMOJIS)
+        self.emojis = kwargs.get("emojis", self.STANDART_EMOJIS)
         self.delete_message: bool = kwargs.get("delete_message", False)
         self.cooldown: Union[int, float] = kwargs.get("cooldown", 60)
         self.initial_embed: Optional[Embed] = kwargs.get("embed", None)
         self.message: Optional[Message] = kwargs.get("message", None)
 
         self.pages = dict()
+        self._titles = list()
+        self._footers = list()
+        self._total_len = 0
         self.category = 0
         self.current = 0
         self.is_active = False
+        self._reactions_task: Optional[Task] = None
+        self._stop_event = Event()
         
     def __repr__(self) -> str:
         f = "<{0.__class__.__name__} count: {0._count} category: {0.category}" \
@@ -98,21 +109,90 @@ class _PaginatorBase:
 
     def __str__(self) -> str:
         """Текст текущей страницы."""
-        return self.pages[self._get_page(self.current)]
+        return str(self.pages[self.category][self.current])
     
+    @property
+    def emojis(self) -> tuple:
+        """Эмодзи, используемые в качестве реакций."""
+        return self._emojis
+
+    @emojis.setter
+    def emojis(self, emojis: tuple) -> None:
+        emojis = tuple(emojis)
+        if len(emojis) != len(self.STANDART_EMOJIS):
+            raise ValueError(
+                "Ожидается {0} эмодзи: top, previous, stop, next, end, "
+                "получено {1}".format(len(self.STANDART_EMOJIS), len(emojis))
+            )
+
+        actions = (
+            self._go_top, self._go_previous, self.stop, 
+            self._go_next, self._go_end
+        )
+        self._emojis = emojis
+        self._emoji_actions = dict(zip(emojis, actions))
+
     @property
     def _count(self) -> int:
-        """Количество страниц."""
-        return len(self.pages)
-        
-    def _get_page(self, count: int) -> tuple:
-        """Получает кортеж с информацией категории из индекса."""
-        return tuple(self.pages.keys())[count]
+        """Количество категорий."""
+        return len(self._titles)
+
+    def _new_category(self, 
+        title: Union[str, _EmptyEmbed], 
+        footer: Union[str, _EmptyEmbed]
+    ) -> int:
+        """Регистрирует пустую категорию и возвращает её индекс."""
+        index = self._count
+        self._titles.append(title)
+        self._footers.append(footer)
+        self.pages[index] = list()
+        return index
+
+    def _or_empty(self, value):
+        """Заменяет пустые значения из `none_types` на `Embed.Empty`."""
+        if value is None:
+            return Embed.Empty
+        try:
+            if value in self.none_types:
+                return Embed.Empty
+        except TypeError:
+            # Нехешируемые значения (например, list) Embed приводит к строке.
+            pass
+        return value
+
+    def _text_len(self, value) -> int:
+        """Длина текста значения в Embed, пустые значения - 0."""
+        value = self._or_empty(value)
+        return 0 if value is Embed.Empty else len(str(value))
     
+    @staticmethod
+    def _embed_content(embed: Embed) -> tuple:
+        """Получает заголовок, описание, футер и Fields Embed.
+        
+        Пустые, отсутствующие и `None` значения приводятся к `None`.
+        """
+        def value(item):
+            return None if item is None or item is Embed.Empty else item
+
+        fields = tuple(
+            (value(f.name), value(f.value), value(f.inline)) 
+            for f in embed.fields
+        )
+        footer = getattr(embed.footer, "text", None)
+        return (
+            value(embed.title), value(embed.description), value(footer), fields
+        )
+
+    @classmethod
+    def _embed_equal(cls, first: Embed, second: Embed) -> bool:
+        """Сравнивает содержимое двух Embed."""
+        return cls._embed_content(first) == cls._embed_content(second)
+
     async def _add_reactions(self, *emojis, message: Optional[Message]) -> None:
         """|coro|
         
-        Добавляет реакции к определенному сообщению.
+        Добавляет реакции к определенному сообщению, 
+        пропуская уже добавленные ботом.
         
         Parameters
         ----------
@@ -124,15 +204,73 @@ class _PaginatorBase:
         """
         message = message or self.ctx.message
         if message:
+            present = {str(r.emoji) for r in message.reactions if r.me}
             for emoji in emojis:
-                await message.add_reaction(emoji)
+                if emoji in present:
+                    continue
+                try:
+                    await message.add_reaction(emoji)
+                except errors.NotFound:
+                    return
+                except errors.HTTPException:
+                    continue
+
+    async def _emit_embed(self, message: Message) -> None:
+        """|coro|
+
+        Обновляет сообщение Embed'ом текущей страницы.
+        """
+        embed = await self.generate_embed()
+        await message.edit(embed=embed)
+
+    @staticmethod
+    def _reaction_emoji(reaction: Reaction) -> str:
+        """Получает эмодзи реакции в виде строки."""
+        emoji = reaction.emoji
+        return emoji if isinstance(emoji, str) else str(emoji)
 
     def _check(self, reaction: Reaction, user: Union[Member, User]) -> bool:
         """Проверки для метода `wait_for`."""
-        return reaction.emoji in self.emojis \
+        message = self.message
+        return message is not None \
+           and reaction.message.id == message.id \
            and user.id == self.ctx.author.id \
-           and self.message is not None \
-           and reaction.message.id == self.message.id
+           and self._reaction_emoji(reaction) in self._emoji_actions
+
+    async def _go_top(self) -> None:
+        """|coro|
+
+        Переключает на предыдущую категорию.
+        """
+        if 0 < self.category:
+            self.current = 0
+            self.category -= 1
+
+    async def _go_previous(self) -> None:
+        """|coro|
+
+        Переключает на предыдущую страницу текущей категории.
+        """
+        if 0 < self.current:
+            self.current -= 1
+
+    async def _go_next(self) -> None:
+        """|coro|
+
+        Переключает на следующую страницу текущей категории.
+        """
+        page_count = len(self.pages[self.category]) - 1
+        if self.current < page_count:
+            self.current += 1
+
+    async def _go_end(self) -> None:
+        """|coro|
+
+        Переключает на следующую категорию.
+        """
+        if self.category < self._count - 1:
+            self.current = 0
+            self.category += 1
 
     async def start(self) -> None:
         """|coro|
@@ -142,25 +280,46 @@ class _PaginatorBase:
         Основной метод класса.
         """
         self.is_active = True
+        self._stop_event.clear()
         message = await self.paginate_message()
         if not message:
             return
 
-        while self.is_active:
-            try:
-                reaction, user = await self.bot.wait_for(
-                    "reaction_add", 
-                    check=self._check,
-                    timeout=self.cooldown
-                ) 
-            except TimeoutError:
-                await self.stop()
-            else:
-                await self.pagination(str(reaction.emoji))
-                await message.remove_reaction(reaction, user)
-
-                embed = await self.generate_embed()
-                await self.ctx.send(embed=embed)
+        # Ожидание реакции прерывается сразу после вызова `stop`, 
+        # а не по истечении `cooldown`.
+        stop_waiter = create_task(self._stop_event.wait())
+        reaction_waiter: Optional[Task] = None
+        try:
+            while self.is_active:
+                reaction_waiter = create_task(
+                    self.bot.wait_for("reaction_add", check=self._check)
+                )
+                done, _ = await wait(
+                    (reaction_waiter, stop_waiter),
+                    timeout=self.cooldown,
+                    return_when=FIRST_COMPLETED
+                )
+                if reaction_waiter not in done:
+                    if stop_waiter not in done:
+                        await self.stop()
+                    break
+
+                reaction, user = reaction_waiter.result()
+                changed = await self.pagination(self._reaction_emoji(reaction))
+                if not self.is_active:
+                    break
+
+                if changed:
+                    await gather(
+                        message.remove_reaction(reaction, user),
+                        self._emit_embed(message)
+                    )
+                else:
+                    await message.remove_reaction(reaction, user)
+        finally:
+            stop_waiter.cancel()
+            if reaction_waiter is not None:
+                reaction_waiter.cancel()
         
     async def stop(self) -> None:
         """|coro|
@@ -169,6 +328,10 @@ class _PaginatorBase:
         параметра `delete_message`.
         """
         self.is_active = False
+        self._stop_event.set()
+        if self._reactions_task and not self._reactions_task.done():
+            self._reactions_task.cancel()
+
         if self.message:
             try:
                 if self.delete_message:
@@ -188,46 +351,40 @@ class _PaginatorBase:
             embed = await self.generate_embed()
 
         if self.message:
-            message = await self.message.edit(embed=embed)
+            embeds = self.message.embeds
+            if not embeds or not self._embed_equal(embeds[0], embed):
+                await self.message.edit(embed=embed)
+            message = self.message
         else:
             message = await self.ctx.send(embed=embed)
 
-        await self._add_reactions(*self.emojis, message=message)
+        # Реакции добавляются в фоне, чтобы Paginator сразу начал 
+        # отслеживать нажатия, сохраняя при этом порядок эмодзи.
+        self._reactions_task = create_task(
+            self._add_reactions(*self.emojis, message=message)
+        )
         self.message = message
         
         return message
     
-    async def pagination(self, emoji: str) -> None:
+    async def pagination(self, emoji: str) -> bool:
         """|coro|
         
         Отвечает за действие, при нажатии реакции под сообщением.
+        Возвращает `True`, если текущая страница изменилась.
         
         Parameters
         ----------
         emoji: :class:`str`
             Эмодзи, полученное нажатием реакции.
         """
-        category_count = self._count - 1
+        position = (self.category, self.current)
 
-        category = self._get_page(self.category)
-        page_count = len(self.pages[category]) - 1
+        action = self._emoji_actions.get(emoji)
+        if action is not None:
+            await action()
 
-        if emoji == self.emojis[0] and 0 < self.category:
-            self.current = 0
-            self.category -= 1
-
-        elif emoji == self.emojis[1] and 0 < self.current:
-            self.current -= 1
-
-        elif emoji == self.emojis[2]:
-            await self.stop()
-
-        elif emoji == self.emojis[3] and self.current < page_count:
-            self.current += 1
-
-        elif emoji == self.emojis[4] and self.category < category_count:
-            self.current = 0
-            self.category += 1
+        return position != (self.category, self.current)
 
     async def generate_embed(self) -> Embed:
         """|coro|
@@ -247,7 +404,7 @@ class TextPaginator(_PaginatorBase):
     ----------
     category: :class:`int`
         Текущая категория.
-    none_types: :class:`tuple`
+    none_types: :class:`frozenset`
         Все NoneType виды в Embed.
     
     Parameters [kwargs]
@@ -263,8 +420,8 @@ class TextPaginator(_PaginatorBase):
         Разделяет текст на части, не превышающие максимальное 
         количество символов, после добавляет страницу к указанной категории.
 
-        Может подняться ошибка из-за большого количества рекурсий, 
-        если текст не может быть разбит на части разделителем.
+        Части, которые не могут быть разбиты разделителем, 
+        разрезаются по `max_size` символов.
     add_category(description, title, footer)
         Добавляет категорию к Paginator.
     add_embed(embed)
@@ -283,32 +440,51 @@ class TextPaginator(_PaginatorBase):
     def __repr__(self) -> str:
         f = " max_size: {0.max_size} separator: {0.separator}>"
         return super().__repr__()[:-1] + f.format(self)
+
+    def __len__(self) -> int:
+        """Общее количество текста на всех страницах."""
+        return self._total_len
     
-    def cut_text(self, category: tuple, text: str) -> None:
+    def cut_text(self, category: int, text: str) -> None:
         """Разделяет текст на страницы.
         
         Parameters
         ----------
-        category: :class:`tuple`
-            Ключ-категория в формате: 
-            (title: :class:`str`, footer: :class:`str`, count: :class:`int`)
+        category: :class:`int`
+            Индекс категории.
         text: :clas:`str`
             Текст, для дальнейшего разделения на части.
         """
         sep = self.separator
+        max_size = self.max_size
+        # Не `splitlines`: он режет и по `\r`, `\x0b`, `\u2028` и т.д.
         split_text = text.strip().split(sep)
-
-        count = len(split_text)
-        while len(sep.join(split_text[:count])) > self.max_size:
-            count -= 1
-        
-        self.pages[category].append(sep.join(split_text[:count]))
-
-        leftovers = sep.join(split_text[count:])
-        if len(leftovers) > self.max_size:
-            self.cut_text(category, leftovers)
-        else:
-            self.pages[category].append(leftovers)
+        pages = self.pages[category]
+        first_page = len(pages)
+
+        # Префиксные суммы длин частей вместе с разделителем: граница 
+        # страницы ищется бинарным поиском, а не перебором частей.
+        sep_len = len(sep)
+        bounds = [0]
+        bounds.extend(accumulate(map(sep_len.__add__, map(len, split_text))))
+
+        start, count = 0, len(split_text)
+        while start < count:
+            limit = bounds[start] + max_size + sep_len
+            end = bisect_right(bounds, limit, start + 1) - 1
+            if end > start:
+                pages.append(sep.join(split_text[start:end]))
+                start = end
+                continue
+
+            # Часть не разбивается разделителем - режем по символам.
+            part = split_text[start]
+            pages.extend(
+                part[i:i + max_size] for i in range(0, len(part), max_size)
+            )
+            start += 1
+
+        self._total_len += sum(len(p) for p in pages[first_page:])
     
     def add_category(self, 
         description: str, 
@@ -326,9 +502,8 @@ class TextPaginator(_PaginatorBase):
         footer: Union[:class:`str`, :class:`_EmptyEmbed`]
             Футер для Embed. По умолчанию - пустой.
         """
-        key = (title, footer, self._count)
-        self.pages[key] = list()
-        self.cut_text(key, description)
+        index = self._new_category(title, footer)
+        self.cut_text(index, description)
     
     def add_embed(self, embed: Embed) -> None:
         """Добавляет готовый Embed к Paginator.
@@ -343,9 +518,8 @@ class TextPaginator(_PaginatorBase):
         else:
             footer = embed.footer
 
-        key = (embed.title, footer, self._count)
-        self.pages[key] = list()
-        self.cut_text(key, embed.description)
+        index = self._new_category(embed.title, footer)
+        self.cut_text(index, embed.description)
     
     def add_from_dict(self, data: dict) -> None:
         """Добавляет категорию(-и) через словарь.
@@ -362,21 +536,24 @@ class TextPaginator(_PaginatorBase):
             (None, None): ["page-1", "page-2"]
         })
         """
-        for category, texts in data.items():
-            key = tuple(list(category) + [self._count])
-            self.pages[key] = texts
+        for (title, footer), texts in data.items():
+            index = self._new_category(title, footer)
+            self.pages[index] = texts
+            self._total_len += sum(self._text_len(t) for t in texts)
         
     async def generate_embed(self) -> Embed:
         """|coro|
         
         Генерирует и возвращает Embed в зависимости от текущей страницы.
         """
-        key = self._get_page(self.category)
-        page = self.pages[key]
-        e = Embed.Empty
+        page = self.pages[self.category]
+        empty = self._or_empty
         
-        embed = Embed(title=key[0] or e, description=page[self.current] or e)
-        embed.set_footer(text=key[1] or e)
+        embed = Embed(
+            title=empty(self._titles[self.category]), 
+            description=empty(page[self.current])
+        )
+        embed.set_footer(text=empty(self._footers[self.category]))
 
         return embed
         
@@ -387,7 +564,8 @@ class FieldPaginator(_PaginatorBase):
     Parameters [kwargs]
     ----------
     max_count: :class:`int`
-        Максимальное количество Fields на страницу.
+        Максимальное количество Fields на страницу. 
+        Discord допускает не более 25 Fields в Embed. По умолчанию - 25.
     
     Methods
     -------
@@ -411,23 +589,26 @@ class FieldPaginator(_PaginatorBase):
         f = " max_count: {0.max_count}"
         return super().__repr__()[:-1] + f.format(self)
 
-    def split_fields(self, category: tuple, fields: list):
+    def __len__(self) -> int:
+        """Общее количество текста в названиях и значениях Fields."""
+        return self._total_len
+
+    def split_fields(self, category: int, fields: Sequence) -> None:
         """Разделяет Fields на страницы.
 
         Parameters
         ----------
-        category: :class:`tuple`
-            Ключ-категория в формате: 
-            (title: :class:`str`, footer: :class:`str`, count: :class:`int`)
-        fields: :class:`list`
+        category: :class:`int`
+            Индекс категории.
+        fields: Union[:class:`list`, :class:`tuple`]
             Список из Field для разделения.
         """
         limit = self.max_count
-        separated = tuple(fields[:limit])
-
-        self.pages[category].append([separated])
-        if len(fields[limit:]) > self.max_count:
-            self.split_fields(category, fields)
+        self.pages[category].extend(
+            fields[i:i + limit] for i in range(0, len(fields), limit)
+        )
+        text_len = self._text_len
+        self._total_len += sum(text_len(f[0]) + text_len(f[1]) for f in fields)
     
     def add_category(self,
         *fields, 
@@ -446,9 +627,8 @@ class FieldPaginator(_PaginatorBase):
         footer: Union[:class:`str`, :class:`_EmptyEmbed`]
             Футер для Embed. По умолчанию - пустой.
         """
-        key = (title, footer, self._count)
-        self.pages[key] = list()
-        self.split_fields(key, list(fields))
+        index = self._new_category(title, footer)
+        self.split_fields(index, fields)
 
     def add_embed(self, embed: Embed) -> None:
         """Добавляет готовый Embed к Paginator.
@@ -463,9 +643,9 @@ class FieldPaginator(_PaginatorBase):
         else:
             footer = embed.footer
 
-        key = (embed.title, footer, self._count)
-        self.pages[key] = list()
-        self.split_fields(key, embed.fields)
+        index = self._new_category(embed.title, footer)
+        fields = [(f.name, f.value, f.inline) for f in embed.fields]
+        self.split_fields(index, fields)
     
     def add_from_dict(self, data: dict) -> None:
         """Добавляет категорию(-и) через словарь.
@@ -478,25 +658,22 @@ class FieldPaginator(_PaginatorBase):
                 (name: :class:`str`, value: :class:`str`, inline: :class:`bool`),
             ]
         """
-        for category, fields in data.items():
-            key = tuple(list(category) + [self._count])
-
-            self.pages[key] = list()
-            self.split_fields(key, fields)
+        for (title, footer), fields in data.items():
+            index = self._new_category(title, footer)
+            self.split_fields(index, fields)
     
     async def generate_embed(self) -> Embed:
         """|coro|
 
         Генерирует и возвращает Embed в зависимости от текущей страницы.
         """
-        key = self._get_page(self.category)
-        page = self.pages[key]
-        e = Embed.Empty
+        page = self.pages[self.category]
+        empty = self._or_empty
         
-        embed = Embed(title=key[0] or e)
-        embed.set_footer(text=key[1] or e)
+        embed = Embed(title=empty(self._titles[self.category]))
+        embed.set_footer(text=empty(self._footers[self.category]))
 
-        for field in self.page[self.current]:
+        for field in page[self.current]:
             embed.add_field(name=field[0], value=field[1], inline=field[2])
         
         return embed